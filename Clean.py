@@ -8,15 +8,22 @@ WARNING: This permanently deletes browser data. Use --dry-run first.
 
 import os
 import sys
-import shutil
+import stat
 import sqlite3
 import argparse
+import functools
 import glob
+import json
 import time
 import random
+import secrets
+import threading
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.request import pathname2url
 import platform
+import re
 import subprocess
 
 # Optional: graceful fallback if psutil not installed
@@ -29,16 +36,17 @@ except Exception:
 # Configuration & utilities
 # ---------------------------
 
-APP_NAMES = {
+# User-data directory per browser, relative to the OS-specific root below
+USERDATA_DIRS = {
     "chrome": {
-        "win": os.path.join(os.environ.get("LOCALAPPDATA", ""), "Google", "Chrome", "User Data"),
-        "mac": os.path.expanduser("~/Library/Application Support/Google/Chrome"),
-        "linux": os.path.expanduser("~/.config/google-chrome"),
+        "win": ("Google", "Chrome", "User Data"),
+        "mac": ("Google", "Chrome"),
+        "linux": ("google-chrome",),
     },
     "edge": {
-        "win": os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Edge", "User Data"),
-        "mac": os.path.expanduser("~/Library/Application Support/Microsoft Edge"),
-        "linux": os.path.expanduser("~/.config/microsoft-edge"),
+        "win": ("Microsoft", "Edge", "User Data"),
+        "mac": ("Microsoft Edge",),
+        "linux": ("microsoft-edge",),
     }
 }
 
@@ -47,99 +55,212 @@ BROWSER_PROCS = {
     "edge": ["msedge", "msedge.exe", "Microsoft Edge"]
 }
 
+# Lowercased once so process matching doesn't re-lower every name per process
+BROWSER_PROCS_LC = {k: tuple(n.lower() for n in v) for k, v in BROWSER_PROCS.items()}
+
+# platform.system() may shell out to uname, so resolve it once
+_PF = platform.system().lower()
+
 def get_os_key():
-    pf = platform.system().lower()
-    if "windows" in pf:
+    if "windows" in _PF:
         return "win"
-    if "darwin" in pf:
+    if "darwin" in _PF:
         return "mac"
     return "linux"
 
 OS_KEY = get_os_key()
 
+@functools.lru_cache(maxsize=None)
+def browser_base(browser_key):
+    """Return the user-data directory of browser_key for the current OS only."""
+    if OS_KEY == "win":
+        root = os.environ.get("LOCALAPPDATA", "")
+    elif OS_KEY == "mac":
+        root = os.path.expanduser("~/Library/Application Support")
+    else:
+        root = os.path.expanduser("~/.config")
+    return os.path.join(root, *USERDATA_DIRS[browser_key][OS_KEY])
+
+# Deletion is syscall-bound, so oversubscribe the CPUs to keep the disk queue full
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_notify_lock = threading.Lock()
+
 def user_notify(msg):
-    print(msg)
+    with _notify_lock:
+        print(msg)
 
 # ---------------------------
 # Find profiles
 # ---------------------------
+
+PROFILE_CACHE_FILE = os.path.join(os.path.expanduser("~/.cache"), "chromedge_cleaner.json")
+
+# browser -> {"base", "profiles", "mtime"}; None unless --profile-cache is given
+_profile_cache = None
+
+def load_profile_cache(path=PROFILE_CACHE_FILE):
+    """Load the cache, dropping anything that isn't {browser: {"base", "profiles", "mtime"}}."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(v, dict)}
+
+def save_profile_cache(cache, path=PROFILE_CACHE_FILE):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        user_notify(f"Could not write profile cache {path}: {e}")
+
+@functools.lru_cache(maxsize=None)
 def find_browser_userdata(browser_key):
-    base = APP_NAMES[browser_key].get(OS_KEY)
-    if not base:
-        return None
-    base = os.path.expanduser(base)
-    if not os.path.exists(base):
+    base = browser_base(browser_key)
+    try:
+        mtime = os.stat(base).st_mtime
+    except OSError:
         return None
+    # Reuse the previous run's listing while the user-data dir is unchanged
+    if _profile_cache is not None:
+        cached = _profile_cache.get(browser_key)
+        cached_profiles = cached.get("profiles") if isinstance(cached, dict) else None
+        if (isinstance(cached_profiles, list) and all(isinstance(p, str) for p in cached_profiles)
+                and cached.get("base") == base and cached.get("mtime") == mtime):
+            return base, tuple(cached_profiles)
     # Profiles typically: "Default", "Profile 1", "Profile 2", etc.
-    profiles = []
-    for p in os.listdir(base):
-        pf = os.path.join(base, p)
-        if os.path.isdir(pf) and (p == "Default" or p.startswith("Profile") or p.lower().endswith("default")):
-            profiles.append(pf)
+    # DirEntry caches the file type from the directory stream, so no per-entry stat
+    profiles, others = [], []
+    with os.scandir(base) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            p = entry.name
+            if p == "Default" or p.startswith("Profile") or p.lower().endswith("default"):
+                profiles.append(entry.path)
+            else:
+                others.append(entry.path)
     # Some installations may use 'Profile 1' etc; fallback: include all directories that contain 'History' file
+    # (reuses the listing above; History is only probed when no name matched)
     if not profiles:
-        for p in os.listdir(base):
-            pf = os.path.join(base, p)
-            if os.path.isdir(pf) and os.path.exists(os.path.join(pf, "History")):
-                profiles.append(pf)
-    return base, profiles
+        profiles = [pf for pf in others if os.path.exists(os.path.join(pf, "History"))]
+    if _profile_cache is not None:
+        _profile_cache[browser_key] = {"base": base, "profiles": profiles, "mtime": mtime}
+    return base, tuple(profiles)
 
 # ---------------------------
 # Terminate browser processes
 # ---------------------------
 def kill_browser_processes(browser_key, dry_run=False, force=False):
     names = BROWSER_PROCS[browser_key]
+    names_lc = BROWSER_PROCS_LC[browser_key]
     found = []
     if psutil:
-        for proc in psutil.process_iter(["name", "exe", "cmdline"]):
+        for proc in psutil.process_iter(["pid", "name"]):
             try:
-                pname = proc.info.get("name") or ""
-                if any(n.lower() in pname.lower() for n in names):
+                pname = (proc.info.get("name") or "").lower()
+                if any(pname == n or pname.startswith(n) for n in names_lc):
                     found.append(proc)
             except Exception:
                 pass
         if not found:
             return []
+        if dry_run:
+            for proc in found:
+                user_notify(f"[DRY RUN] Would terminate process PID={proc.pid} ({proc.info['name']})")
+            return found
+        # Signal everything first, then wait once for the whole group
         for proc in found:
-            if dry_run:
-                user_notify(f"[DRY RUN] Would terminate process PID={proc.pid} ({proc.name()})")
-                continue
             try:
                 proc.terminate()
-                gone, alive = psutil.wait_procs([proc], timeout=5)
-                if alive and force:
-                    for p in alive:
-                        p.kill()
-                user_notify(f"Terminated PID={proc.pid} ({proc.name()})")
             except Exception as e:
                 user_notify(f"Failed to terminate PID={proc.pid}: {e}")
+        on_gone = lambda p: user_notify(f"Terminated PID={p.pid} ({p.info['name']})")
+        gone, alive = psutil.wait_procs(found, timeout=5, callback=on_gone)
+        if alive and force:
+            for p in alive:
+                try:
+                    p.kill()
+                except Exception as e:
+                    user_notify(f"Failed to kill PID={p.pid}: {e}")
+            gone, alive = psutil.wait_procs(alive, timeout=2, callback=on_gone)
+        for p in alive:
+            user_notify(f"Process still running: PID={p.pid} ({p.info['name']})")
         return found
     else:
         # Fallback: platform kill by name
         if dry_run:
             user_notify(f"[DRY RUN] Would attempt to kill processes by name: {names}")
             return []
-        if platform.system().lower().startswith("windows"):
+        # One invocation for all names: taskkill takes repeated /IM, pkill takes an ERE alternation
+        if _PF.startswith("windows"):
+            cmd = ["taskkill", "/F"]
             for n in names:
-                subprocess.run(["taskkill", "/F", "/IM", n], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                cmd += ["/IM", n]
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
         else:
-            for n in names:
-                subprocess.run(["pkill", "-f", n], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.run(["pkill", "-f", "|".join(map(re.escape, names))],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         user_notify("Kill commands issued (psutil not available to check).")
         return []
 
 # ---------------------------
 # Secure overwrite (shred) helper
 # ---------------------------
+SHRED_CHUNK = 1 << 20  # write size with --shred-unique (fresh os.urandom bytes per chunk)
+# Default path: every write is a slice of one shared random block of this size. Each file
+# starts at its own random offset into the block, but the pattern repeats every
+# SHRED_BUF_SIZE bytes within a file; use --shred-unique where that matters.
+SHRED_BUF_SIZE = 16 << 20
+
+# Set by --shred-unique: draw fresh CSPRNG bytes per chunk instead of reusing the shared buffer
+_shred_unique = False
+
+@functools.lru_cache(maxsize=None)
+def _shred_buffer():
+    """One process-wide block of random bytes, reused for every shred overwrite."""
+    return memoryview(secrets.token_bytes(SHRED_BUF_SIZE))
+
 def overwrite_and_remove(path, passes=1):
+    # Stat first so a missing file (e.g. a journal already removed with its DB)
+    # returns without spawning shred; callers report the real error on their own remove
     try:
         size = os.path.getsize(path)
-        with open(path, "r+b") as f:
+    except OSError:
+        return False
+    # On Linux let coreutils shred do the overwrite + unlink natively
+    if OS_KEY == "linux":
+        try:
+            rc = subprocess.run(["shred", "-u", "-n", str(passes), "--", path],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+            if rc == 0:
+                return True
+        except FileNotFoundError:
+            pass
+    try:
+        # O_DSYNC makes each write durable, replacing an fsync per pass where supported
+        dsync = getattr(os, "O_DSYNC", 0)
+        fd = os.open(path, os.O_WRONLY | dsync | getattr(os, "O_BINARY", 0))
+        with os.fdopen(fd, "wb", buffering=0) as f:
             for _ in range(passes):
                 f.seek(0)
-                f.write(os.urandom(size))
-                f.flush()
-                os.fsync(f.fileno())
+                written = 0
+                offset = secrets.randbelow(SHRED_BUF_SIZE)
+                while written < size:
+                    if _shred_unique:
+                        written += f.write(os.urandom(min(SHRED_CHUNK, size - written)))
+                    else:
+                        buf = _shred_buffer()
+                        n = f.write(buf[offset:offset + (size - written)])
+                        written += n
+                        offset = (offset + n) % len(buf)
+                if not dsync:
+                    os.fsync(f.fileno())
         os.remove(path)
         return True
     except Exception:
@@ -153,14 +274,140 @@ def overwrite_and_remove(path, passes=1):
 # Clearing functions
 # ---------------------------
 
-def remove_path(path, dry_run=False, shred=False):
-    if not os.path.exists(path):
-        return False
+# *at syscalls (unlinkat/openat) need dir_fd support, which Windows lacks
+_HAVE_DIR_FD = {os.open, os.unlink, os.rmdir} <= os.supports_dir_fd and os.scandir in os.supports_fd
+
+def _rmtree_fd(dirfd):
+    with os.scandir(dirfd) as it:
+        entries = list(it)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            fd = os.open(entry.name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=dirfd)
+            try:
+                _rmtree_fd(fd)
+            finally:
+                os.close(fd)
+            os.rmdir(entry.name, dir_fd=dirfd)
+        else:
+            os.unlink(entry.name, dir_fd=dirfd)
+
+def _fast_rmtree_py(path):
+    """In-process recursive delete that opens each directory once and unlinks
+    its entries relative to that fd, avoiding a full path lookup per file.
+
+    Profile trees contain no symlinks by design, so unlike shutil.rmtree there is
+    no per-entry islink() stat; only the top-level path is checked with one lstat.
+    """
+    if stat.S_ISLNK(os.lstat(path).st_mode):
+        os.unlink(path)
+        return
+    if not _HAVE_DIR_FD:
+        # os.walk's DirEntry types come free from the directory listing on Windows
+        for root, dirs, files in os.walk(path, topdown=False):
+            for name in files:
+                os.unlink(os.path.join(root, name))
+            for name in dirs:
+                p = os.path.join(root, name)
+                try:
+                    os.rmdir(p)
+                except NotADirectoryError:
+                    os.unlink(p)  # symlink to a directory (POSIX)
+        os.rmdir(path)
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        _rmtree_fd(fd)
+    finally:
+        os.close(fd)
+    os.rmdir(path)
+
+def _fast_rmtree(*paths):
+    """Remove one or more directory trees in a single native rm/rd call.
+
+    Falls back to _fast_rmtree_py only when the native tool is unavailable.
+    Returns True if every path was removed.
+    """
+    if not paths:
+        return True
+    if OS_KEY == "win":
+        cmd = ["cmd", "/c", "rd", "/s", "/q", *paths]
+    else:
+        cmd = ["rm", "-rf", "--", *paths]
+    try:
+        rc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+    except FileNotFoundError:
+        for p in paths:
+            try:
+                _fast_rmtree_py(p)
+            except OSError:
+                pass
+        return not any(os.path.exists(p) for p in paths)
+    return rc == 0
+
+_trash_pool = None
+_trash_lock = threading.Lock()
+
+# Name given to a tree renamed aside by _move_to_trash, e.g. "Cache.trash-1234-9f3a0c1d"
+TRASH_RE = re.compile(r"^(?P<name>.+)\.trash-\d+-[0-9a-f]+$")
+
+def _purge_trash(pairs):
+    """Delete queued trees; returns the reported paths that were left behind."""
+    if _fast_rmtree(*(trash for _, trash in pairs)):
+        return []
+    failed = [orig for orig, trash in pairs if os.path.lexists(trash)]
+    if failed:
+        user_notify(f"Background delete incomplete: {', '.join(failed)}")
+    return failed
+
+def _queue_purge(pairs):
+    """Queue [(reported_path, path_to_delete)] for background deletion; returns the Future."""
+    global _trash_pool
+    with _trash_lock:
+        if _trash_pool is None:
+            # Tree deletes are the dominant cost, so keep the same concurrency as the profile pool
+            _trash_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="trash")
+        return _trash_pool.submit(_purge_trash, pairs)
+
+def _move_to_trash(*paths):
+    """Rename trees aside (a cheap metadata op) and delete them on a background thread.
+
+    Returns (stuck, future): the paths that could not be renamed, which callers
+    must delete themselves, and the Future of the background purge (or None).
+    """
+    moved, stuck = [], []
+    for p in paths:
+        trash = f"{p}.trash-{os.getpid()}-{random.getrandbits(32):x}"
+        try:
+            os.rename(p, trash)
+            moved.append((p, trash))
+        except OSError:
+            stuck.append(p)
+    return stuck, (_queue_purge(moved) if moved else None)
+
+def drain_trash():
+    """Block until every background delete queued by _move_to_trash has finished."""
+    global _trash_pool
+    with _trash_lock:
+        pool, _trash_pool = _trash_pool, None
+    if pool:
+        pool.shutdown(wait=True)
+
+def remove_path(path, dry_run=False, shred=False, is_dir=None):
+    """is_dir: file type when already known (e.g. from a DirEntry), saving a stat.
+
+    Returns True on removal, False on failure and None if the path was already
+    gone; missing paths are detected from the failing operation itself rather
+    than with an exists() preflight.
+    """
     if dry_run:
+        if not os.path.lexists(path):
+            return None
         user_notify(f"[DRY RUN] Would remove: {path}")
         return True
     try:
-        if os.path.isfile(path):
+        if is_dir is None:
+            is_dir = stat.S_ISDIR(os.lstat(path).st_mode)
+        if not is_dir:
             if shred:
                 ok = overwrite_and_remove(path)
                 if not ok:
@@ -168,37 +415,111 @@ def remove_path(path, dry_run=False, shred=False):
             else:
                 os.remove(path)
         else:
-            # remove directory tree
-            shutil.rmtree(path, ignore_errors=False)
+            # remove directory tree synchronously so the result is final; clean_profile
+            # batches the common trees through _move_to_trash and tracks those itself
+            if not _fast_rmtree(path):
+                raise OSError(f"native delete failed for {path}")
         user_notify(f"Removed: {path}")
         return True
+    except FileNotFoundError:
+        return None
     except Exception as e:
         user_notify(f"Failed to remove {path}: {e}")
         return False
 
-def clear_sqlite_table(db_path, queries, dry_run=False):
-    if not os.path.exists(db_path):
-        return False
+def _nuke_sqlite(db_path, dry_run=False, shred=False):
+    """Wipe a SQLite DB by unlinking it plus its -journal/-wal/-shm files.
+
+    Far cheaper than DELETE + VACUUM; Chromium recreates the DB on next start.
+    """
     if dry_run:
-        user_notify(f"[DRY RUN] Would execute cleanup queries on DB: {db_path}")
+        if not os.path.exists(db_path):
+            return False
+        user_notify(f"[DRY RUN] Would remove DB: {db_path}")
         return True
     try:
-        # Connect and run queries
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        for q in queries:
-            cur.execute(q)
-        conn.commit()
-        conn.close()
-        user_notify(f"Run cleanup queries on {db_path}")
+        if not (shred and overwrite_and_remove(db_path)):
+            os.unlink(db_path)
+        # Journals/WAL hold the most recently written pages, so they get shredded too
+        for suffix in ("-journal", "-wal", "-shm"):
+            sidecar = db_path + suffix
+            try:
+                # Most sidecars don't exist; one lstat skips them before any shred work
+                os.lstat(sidecar)
+                if not (shred and overwrite_and_remove(sidecar)):
+                    os.unlink(sidecar)
+            except FileNotFoundError:
+                pass
+        user_notify(f"Removed DB: {db_path}")
         return True
-    except sqlite3.OperationalError as e:
-        user_notify(f"DB locked or operation failed ({db_path}): {e}")
+    except FileNotFoundError:
         return False
     except Exception as e:
-        user_notify(f"Error cleaning DB {db_path}: {e}")
+        user_notify(f"Failed to remove DB {db_path}: {e}")
         return False
 
+def _sqlite_failure(db_path, e):
+    if isinstance(e, sqlite3.OperationalError) and "locked" in str(e):
+        user_notify(f"DB locked ({db_path}): {e}")
+    else:
+        user_notify(f"Error cleaning DB {db_path}: {e}")
+
+def clear_sqlite_tables(db_tables, dry_run=False, vacuum=False):
+    """Empty tables across several DBs through one connection.
+
+    db_tables: {db_path: [table, ...]}. Every DB is ATTACHed to a single
+    in-memory connection, sharing one connection setup; each DB still gets its
+    own transaction so one failure doesn't roll back the others. Tables the
+    DB doesn't have (schemas vary by version) are skipped. Returns {db_path: ok}.
+    """
+    if dry_run:
+        done = {}
+        for db_path in db_tables:
+            done[db_path] = os.path.exists(db_path)
+            if done[db_path]:
+                user_notify(f"[DRY RUN] Would execute cleanup queries on DB: {db_path}")
+        return done
+    done = {db_path: False for db_path in db_tables}
+    try:
+        conn = sqlite3.connect(":memory:", uri=True)
+    except Exception as e:
+        user_notify(f"Error opening SQLite: {e}")
+        return done
+    try:
+        cur = conn.cursor()
+        # Rows are being discarded anyway, so skip the rollback journal and fsyncs
+        cur.execute("PRAGMA locking_mode=EXCLUSIVE;")
+        for i, (db_path, tables) in enumerate(db_tables.items()):
+            alias = f"db{i}"
+            try:
+                # mode=rw makes a missing DB fail to attach instead of being created
+                cur.execute(f"ATTACH DATABASE ? AS {alias};", (f"file:{pathname2url(db_path)}?mode=rw",))
+                cur.execute(f"PRAGMA {alias}.journal_mode=OFF;")
+                cur.execute(f"PRAGMA {alias}.synchronous=OFF;")
+                existing = {r[0] for r in cur.execute(f"SELECT name FROM {alias}.sqlite_master WHERE type='table';")}
+                script = ["BEGIN IMMEDIATE;"]
+                script += [f'DELETE FROM {alias}."{t}";' for t in tables if t in existing]
+                script.append("COMMIT;")
+                cur.executescript("\n".join(script))
+                if vacuum:
+                    # Switching to incremental auto-vacuum needs one full VACUUM; later runs only trim free pages
+                    if cur.execute(f"PRAGMA {alias}.auto_vacuum;").fetchone()[0] != 2:
+                        cur.execute(f"PRAGMA {alias}.auto_vacuum=INCREMENTAL;")
+                        cur.execute(f"VACUUM {alias};")
+                    else:
+                        cur.execute(f"PRAGMA {alias}.incremental_vacuum;")
+                done[db_path] = True
+                user_notify(f"Run cleanup queries on {db_path}")
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                _sqlite_failure(db_path, e)
+    except Exception as e:
+        user_notify(f"Error cleaning DBs {', '.join(db_tables)}: {e}")
+    finally:
+        conn.close()
+    return done
+
 # ---------------------------
 # Browser-specific cleaning plan
 # ---------------------------
@@ -211,74 +532,155 @@ COMMON_ITEMS = [
     "Top Sites", "Favicons", "History Provider Cache", "Thumbnails"
 ]
 
-DB_CLEAN_QUERIES = {
-    # Maps DB name -> SQL queries to wipe sensitive tables (non exhaustive)
-    "History": [
-        "DELETE FROM urls;",
-        "DELETE FROM visits;",
-        "DELETE FROM downloads;",
-        "VACUUM;"
-    ],
-    "Cookies": [
-        "DELETE FROM cookies;",
-        "VACUUM;"
-    ],
-    "Web Data": [
-        "DELETE FROM autofill;",
-        "DELETE FROM autofill_profiles;",
-        "VACUUM;"
-    ],
-    "Login Data": [
-        "DELETE FROM logins;",
-        "VACUUM;"
-    ],
+DB_FILES = ["History", "Cookies", "Web Data", "Login Data", "Network Action Predictor"]
+
+LOOSE_FILES = [
+    "Cookies-journal", "Current Session", "Current Tabs", "Last Session",
+    "Last Tabs", "Preferences", "Secure Preferences", "Visited Links"
+]
+
+# Membership test for names recovered from leftover .trash-* trees
+COMMON_SET = frozenset(COMMON_ITEMS)
+
+DB_CLEAN_TABLES = {
+    # Maps DB name -> tables to empty (non exhaustive)
+    # No VACUUM here: it rewrites the whole file for a size-only gain (see --vacuum)
+    "History": ["urls", "visits", "downloads"],
+    "Cookies": ["cookies"],
+    "Web Data": ["autofill", "autofill_profiles"],
+    "Login Data": ["logins"],
     # Note: databases names may vary by version; we will try matching exact filenames
 }
 
+def db_plan(dbname, options):
+    """Decide a DB's end state before touching it.
+
+    Returns None (leave alone), "delete" (unlink the file; no DELETE/VACUUM I/O)
+    or "clean" (empty its tables in place, only with --in-place).
+    --in-place takes precedence over --shred, which then applies only to the
+    files that are actually removed.
+    """
+    if dbname == "Login Data" and not options.get("remove_passwords", False):
+        return None
+    if options.get("in_place", False) and dbname in DB_CLEAN_TABLES:
+        return "clean"
+    return "delete"
+
 def clean_profile(profile_path, options):
     """
     options: dict with keys:
-      dry_run, shred, remove_passwords(bool), verbose
+      dry_run, shred, remove_passwords(bool), in_place(bool), vacuum(bool), verbose
     """
     results = {"deleted": [], "failed": []}
-    # 1) Delete common folders
+    # One directory scan replaces an exists() stat per candidate name
+    try:
+        with os.scandir(profile_path) as it:
+            present = {e.name: e for e in it}
+    except OSError as e:
+        user_notify(f"Cannot read profile {profile_path}: {e}")
+        results["failed"].append(profile_path)
+        return results
+
+    # 1) Delete common folders (directories are moved aside and go to one batched native delete)
+    # Nested names like "Service Worker/CacheStorage" are never top-level entries; they go with their parent
+    dirs = []
+    # Iterate the ordered lists (not set intersections) so deletion order and the summary are stable
     for name in COMMON_ITEMS:
-        rel = os.path.join(profile_path, name)
-        if os.path.exists(rel):
-            ok = remove_path(rel, dry_run=options["dry_run"], shred=options["shred"])
-            (results["deleted"] if ok else results["failed"]).append(rel)
+        entry = present.get(name)
+        if entry is None:
+            continue
+        is_dir = entry.is_dir(follow_symlinks=False)
+        if is_dir and not options["dry_run"]:
+            dirs.append(entry.path)
+        else:
+            ok = remove_path(entry.path, dry_run=options["dry_run"], shred=options["shred"], is_dir=is_dir)
+            if ok is not None:
+                (results["deleted"] if ok else results["failed"]).append(entry.path)
+    # Trees left renamed aside by an interrupted or failed earlier run
+    leftovers = []
+    for name, entry in present.items():
+        m = TRASH_RE.match(name)
+        if m and m.group("name") in COMMON_SET and entry.is_dir(follow_symlinks=False):
+            if options["dry_run"]:
+                remove_path(entry.path, dry_run=True, is_dir=True)
+                results["deleted"].append(entry.path)
+            else:
+                leftovers.append(entry.path)
+    # Background purges; run_clean folds their failures into the results after drain_trash()
+    results["pending"] = []
+    if leftovers:
+        results["pending"].append(_queue_purge([(p, p) for p in leftovers]))
+        for p in leftovers:
+            user_notify(f"Removed: {p}")
+            results["deleted"].append(p)
+    if dirs:
+        stuck, pending = _move_to_trash(*dirs)
+        if pending:
+            results["pending"].append(pending)
+        ok = _fast_rmtree(*stuck)
+        for d in dirs:
+            if ok or not os.path.exists(d):
+                user_notify(f"Removed: {d}")
+                results["deleted"].append(d)
+            else:
+                user_notify(f"Failed to remove {d}")
+                results["failed"].append(d)
 
     # 2) Databases: History, Cookies, Web Data, Login Data
-    db_files = {
-        "History": os.path.join(profile_path, "History"),
-        "Cookies": os.path.join(profile_path, "Cookies"),
-        "Web Data": os.path.join(profile_path, "Web Data"),
-        "Login Data": os.path.join(profile_path, "Login Data"),
-        "Network Action Predictor": os.path.join(profile_path, "Network Action Predictor")
-    }
     # Some versions embed history DB under 'databases' folder or with suffixes; attempt matches
-    for dbname, dbpath in db_files.items():
-        if os.path.exists(dbpath):
-            # For passwords, only delete if option set
-            if dbname == "Login Data" and not options.get("remove_passwords", False):
-                user_notify(f"Skipping saved passwords DB (Login Data). Use --remove-passwords to remove.")
-            else:
-                queries = DB_CLEAN_QUERIES.get(dbname, [])
-                if queries:
-                    ok = clear_sqlite_table(dbpath, queries, dry_run=options["dry_run"])
-                    (results["deleted"] if ok else results["failed"]).append(dbpath)
-                else:
-                    # If no queries defined, remove file entirely
-                    ok = remove_path(dbpath, dry_run=options["dry_run"], shred=options["shred"])
-                    (results["deleted"] if ok else results["failed"]).append(dbpath)
+    selective = {}
+    for dbname in DB_FILES:
+        if dbname not in present:
+            continue
+        dbpath = present[dbname].path
+        plan = db_plan(dbname, options)
+        # For passwords, only delete if option set
+        if plan is None:
+            user_notify(f"Skipping saved passwords DB (Login Data). Use --remove-passwords to remove.")
+        elif plan == "delete":
+            # Full wipe: unlink the DB (and journals) rather than DELETE + VACUUM
+            ok = _nuke_sqlite(dbpath, dry_run=options["dry_run"], shred=options["shred"])
+            (results["deleted"] if ok else results["failed"]).append(dbpath)
+        else:
+            selective[dbpath] = DB_CLEAN_TABLES[dbname]
+    # Row-level cleanups for all remaining DBs share one connection
+    if selective:
+        done = clear_sqlite_tables(selective, dry_run=options["dry_run"], vacuum=options.get("vacuum", False))
+        for dbpath, ok in done.items():
+            (results["deleted"] if ok else results["failed"]).append(dbpath)
 
     # 3) Other files: Cookies/journal, Last Session, Last Tabs, Current Session, Current Tabs
-    loose_files = ["Cookies-journal", "Current Session", "Current Tabs", "Last Session", "Last Tabs", "Preferences", "Secure Preferences", "Visited Links"]
-    for fname in loose_files:
-        fpath = os.path.join(profile_path, fname)
-        if os.path.exists(fpath):
-            ok = remove_path(fpath, dry_run=options["dry_run"], shred=options["shred"])
-            (results["deleted"] if ok else results["failed"]).append(fpath)
+    # `present` predates step 2, which may already have removed a DB's journal; missing files are skipped
+    loose = [present[fname] for fname in LOOSE_FILES if fname in present]
+    # Plain unlinks go through one profile dir fd (unlinkat), skipping a path walk per file;
+    # Windows has no dir_fd support and keeps using the scandir paths via remove_path
+    pfd = None
+    if loose and _HAVE_DIR_FD and not options["dry_run"] and not options["shred"]:
+        try:
+            pfd = os.open(profile_path, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            pfd = None
+    try:
+        for entry in loose:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if pfd is not None and not is_dir:
+                try:
+                    os.unlink(entry.name, dir_fd=pfd)
+                    user_notify(f"Removed: {entry.path}")
+                    ok = True
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    user_notify(f"Failed to remove {entry.path}: {e}")
+                    ok = False
+            else:
+                ok = remove_path(entry.path, dry_run=options["dry_run"], shred=options["shred"], is_dir=is_dir)
+                if ok is None:
+                    continue
+            (results["deleted"] if ok else results["failed"]).append(entry.path)
+    finally:
+        if pfd is not None:
+            os.close(pfd)
 
     # 4) Downloaded files history: downloads metadata is in History DB (deleted above), but also 'Cache' may hold bits
     # 5) Optionally wipe 'Local State' if user requests (this affects sign-in state), not per profile but in user data root
@@ -289,10 +691,17 @@ def clean_profile(profile_path, options):
 # ---------------------------
 
 def run_clean(args):
+    global _profile_cache, _shred_unique
+    if args.profile_cache:
+        _profile_cache = load_profile_cache()
+    _shred_unique = args.shred_unique
+
     options = {
         "dry_run": args.dry_run,
         "shred": args.shred,
         "remove_passwords": args.remove_passwords,
+        "in_place": args.in_place,
+        "vacuum": args.vacuum,
         "verbose": args.verbose
     }
 
@@ -305,36 +714,57 @@ def run_clean(args):
         targets = ["chrome", "edge"]
 
     overall = {"cleaned": {}, "skipped": []}
+    pending = {}
+
+    # Profiles are independent, so clean them concurrently (each DB job opens its own connection)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for t in targets:
+            info = find_browser_userdata(t)
+            if not info:
+                user_notify(f"No user data folder found for {t} on this machine.")
+                overall["skipped"].append(t)
+                continue
+            base_path, profiles = info
+            if not profiles:
+                user_notify(f"No profiles detected for {t} in {base_path}.")
+                overall["skipped"].append(t)
+                continue
 
-    for t in targets:
-        info = find_browser_userdata(t)
-        if not info:
-            user_notify(f"No user data folder found for {t} on this machine.")
-            overall["skipped"].append(t)
-            continue
-        base_path, profiles = info
-        if not profiles:
-            user_notify(f"No profiles detected for {t} in {base_path}.")
-            overall["skipped"].append(t)
-            continue
-
-        user_notify(f"Preparing to clean {t}. Found base: {base_path}. Profiles: {len(profiles)}")
-
-        # Attempt to terminate running browser processes
-        if not args.no_kill:
-            kill_browser_processes(t, dry_run=args.dry_run, force=args.force_kill)
-
-        per_browser_results = {}
-        for p in profiles:
-            user_notify(f"Cleaning profile: {p}")
-            res = clean_profile(p, options)
-            per_browser_results[p] = res
-        overall["cleaned"][t] = per_browser_results
-
-        # optional: wipe 'Local State' (contains last active profile, signed-in accounts)
-        if args.remove_local_state:
-            ls = os.path.join(base_path, "Local State")
-            remove_path(ls, dry_run=args.dry_run, shred=args.shred)
+            user_notify(f"Preparing to clean {t}. Found base: {base_path}. Profiles: {len(profiles)}")
+
+            # Attempt to terminate running browser processes
+            if not args.no_kill:
+                kill_browser_processes(t, dry_run=args.dry_run, force=args.force_kill)
+
+            futures = {}
+            for p in profiles:
+                user_notify(f"Cleaning profile: {p}")
+                futures[pool.submit(clean_profile, p, options)] = p
+            pending[t] = (profiles, futures)
+
+            # optional: wipe 'Local State' (contains last active profile, signed-in accounts)
+            if args.remove_local_state:
+                ls = os.path.join(base_path, "Local State")
+                remove_path(ls, dry_run=args.dry_run, shred=args.shred)
+
+        for t, (profiles, futures) in pending.items():
+            done = {}
+            for fut in as_completed(futures):
+                done[futures[fut]] = fut.result()
+            # keep the summary in discovery order
+            overall["cleaned"][t] = {p: done[p] for p in profiles}
+
+    # renamed trees are still being deleted in the background
+    drain_trash()
+    for per_browser in overall["cleaned"].values():
+        for res in per_browser.values():
+            for fut in res.pop("pending", []):
+                for p in fut.result():
+                    res["deleted"].remove(p)
+                    res["failed"].append(p)
+
+    if _profile_cache is not None:
+        save_profile_cache(_profile_cache)
 
     # summary
     user_notify("\n=== Cleaning complete — Summary ===")
@@ -363,10 +793,14 @@ def parse_args():
     p.add_argument("--all", action="store_true", help="Target both browsers (default)")
     p.add_argument("--dry-run", action="store_true", help="Show what would be removed, don't delete")
     p.add_argument("--shred", action="store_true", help="Attempt to overwrite files before deletion (slower)")
+    p.add_argument("--shred-unique", action="store_true", help="With --shred, use fresh random bytes for every write instead of a shared random block (slower). Only affects the built-in overwrite; on Linux coreutils shred is used when available")
     p.add_argument("--remove-passwords", action="store_true", help="Remove saved passwords (destructive!)")
+    p.add_argument("--in-place", action="store_true", help="Empty sensitive DB tables instead of deleting the DB files (keeps other settings; slower; takes precedence over --shred for DBs)")
+    p.add_argument("--vacuum", action="store_true", help="With --in-place, shrink cleaned DBs via incremental vacuum (slower)")
     p.add_argument("--remove-local-state", action="store_true", help="Also remove Local State (affects sign-in state)")
     p.add_argument("--no-kill", action="store_true", help="Do not attempt to close/kill running browsers")
     p.add_argument("--force-kill", action="store_true", help="If browser processes don't terminate, force kill them")
+    p.add_argument("--profile-cache", action="store_true", help=f"Reuse profile discovery between runs (cached in {PROFILE_CACHE_FILE})")
     p.add_argument("--verbose", action="store_true", help="Verbose logging")
     return p.parse_args()
 
@@ -376,4 +810,8 @@ if __name__ == "__main__":
         user_notify("WARNING: --remove-passwords is ON. This will permanently delete saved passwords!")
     if args.dry_run:
         user_notify("Dry run enabled — no destructive actions will be taken.")
+    if args.in_place and args.shred:
+        user_notify("NOTE: --in-place keeps the browser DB files; --shred only applies to files that are removed.")
+    if args.vacuum and not args.in_place:
+        user_notify("NOTE: --vacuum has no effect without --in-place (DB files are deleted instead).")
     run_clean(args)
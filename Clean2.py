@@ -8,10 +8,14 @@ saved passwords, session data, etc. USE CAREFULLY.
 """
 
 import os
-import shutil
+import functools
+import stat
 import sqlite3
 import platform
+import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -23,16 +27,17 @@ except ImportError:
 # Paths
 # ---------------------------
 
-APP_NAMES = {
+# User-data directory per browser, relative to the OS-specific root below
+USERDATA_DIRS = {
     "chrome": {
-        "win": os.path.join(os.environ.get("LOCALAPPDATA", ""), "Google", "Chrome", "User Data"),
-        "mac": os.path.expanduser("~/Library/Application Support/Google/Chrome"),
-        "linux": os.path.expanduser("~/.config/google-chrome"),
+        "win": ("Google", "Chrome", "User Data"),
+        "mac": ("Google", "Chrome"),
+        "linux": ("google-chrome",),
     },
     "edge": {
-        "win": os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Edge", "User Data"),
-        "mac": os.path.expanduser("~/Library/Application Support/Microsoft Edge"),
-        "linux": os.path.expanduser("~/.config/microsoft-edge"),
+        "win": ("Microsoft", "Edge", "User Data"),
+        "mac": ("Microsoft Edge",),
+        "linux": ("microsoft-edge",),
     }
 }
 
@@ -41,51 +46,146 @@ BROWSER_PROCS = {
     "edge": ["msedge", "msedge.exe", "Microsoft Edge"]
 }
 
+# platform.system() may shell out to uname, so resolve it once
+_PF = platform.system().lower()
+
 def get_os_key():
-    pf = platform.system().lower()
-    if "windows" in pf:
+    if "windows" in _PF:
         return "win"
-    if "darwin" in pf:
+    if "darwin" in _PF:
         return "mac"
     return "linux"
 
 OS_KEY = get_os_key()
 
+@functools.lru_cache(maxsize=None)
+def browser_base(browser_key):
+    """Return the user-data directory of browser_key for the current OS only."""
+    if OS_KEY == "win":
+        root = os.environ.get("LOCALAPPDATA", "")
+    elif OS_KEY == "mac":
+        root = os.path.expanduser("~/Library/Application Support")
+    else:
+        root = os.path.expanduser("~/.config")
+    return os.path.join(root, *USERDATA_DIRS[browser_key][OS_KEY])
+
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_print_lock = threading.Lock()
+
+def log(msg):
+    with _print_lock:
+        print(msg)
+
 # ---------------------------
 # Kill browser processes
 # ---------------------------
 
 def kill_browser_processes(names):
     if psutil:
-        for proc in psutil.process_iter(["name"]):
+        names_lc = tuple(n.lower() for n in names)
+        for proc in psutil.process_iter(["pid", "name"]):
             try:
-                if any(n.lower() in (proc.info.get("name") or "").lower() for n in names):
+                pname = (proc.info.get("name") or "").lower()
+                if any(pname == n or pname.startswith(n) for n in names_lc):
                     proc.kill()
                     print(f"Killed {proc.info['name']} (PID {proc.pid})")
             except Exception:
                 pass
     else:
-        if platform.system().lower().startswith("windows"):
+        # One invocation for all names: taskkill takes repeated /IM, pkill takes an ERE alternation
+        if _PF.startswith("windows"):
+            cmd = ["taskkill", "/F"]
             for n in names:
-                subprocess.run(["taskkill", "/F", "/IM", n], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                cmd += ["/IM", n]
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
         else:
-            for n in names:
-                subprocess.run(["pkill", "-f", n], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.run(["pkill", "-f", "|".join(map(re.escape, names))],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 # ---------------------------
 # Remove helper
 # ---------------------------
 
-def remove_path(path):
-    if os.path.exists(path):
-        try:
-            if os.path.isfile(path):
-                os.remove(path)
-            else:
-                shutil.rmtree(path, ignore_errors=True)
-            print(f"Deleted: {path}")
-        except Exception as e:
-            print(f"Failed: {path} ({e})")
+# *at syscalls (unlinkat/openat) need dir_fd support, which Windows lacks
+_HAVE_DIR_FD = {os.open, os.unlink, os.rmdir} <= os.supports_dir_fd and os.scandir in os.supports_fd
+
+def _rmtree_fd(dirfd):
+    with os.scandir(dirfd) as it:
+        entries = list(it)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            fd = os.open(entry.name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=dirfd)
+            try:
+                _rmtree_fd(fd)
+            finally:
+                os.close(fd)
+            os.rmdir(entry.name, dir_fd=dirfd)
+        else:
+            os.unlink(entry.name, dir_fd=dirfd)
+
+def _fast_rmtree_py(path):
+    """In-process recursive delete that opens each directory once and unlinks
+    its entries relative to that fd, avoiding a full path lookup per file.
+
+    Profile trees contain no symlinks by design, so unlike shutil.rmtree there is
+    no per-entry islink() stat; only the top-level path is checked with one lstat.
+    """
+    if stat.S_ISLNK(os.lstat(path).st_mode):
+        os.unlink(path)
+        return
+    if not _HAVE_DIR_FD:
+        # os.walk's DirEntry types come free from the directory listing on Windows
+        for root, dirs, files in os.walk(path, topdown=False):
+            for name in files:
+                os.unlink(os.path.join(root, name))
+            for name in dirs:
+                p = os.path.join(root, name)
+                try:
+                    os.rmdir(p)
+                except NotADirectoryError:
+                    os.unlink(p)  # symlink to a directory (POSIX)
+        os.rmdir(path)
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        _rmtree_fd(fd)
+    finally:
+        os.close(fd)
+    os.rmdir(path)
+
+def _fast_rmtree(*paths):
+    """Remove directory trees in one native rm/rd call (in-process fallback)."""
+    if not paths:
+        return
+    if OS_KEY == "win":
+        cmd = ["cmd", "/c", "rd", "/s", "/q", *paths]
+    else:
+        cmd = ["rm", "-rf", "--", *paths]
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        for p in paths:
+            try:
+                _fast_rmtree_py(p)
+            except OSError:
+                pass
+
+def remove_path(path, is_dir=None):
+    # No exists() preflight: a missing path surfaces as FileNotFoundError
+    try:
+        if is_dir is None:
+            is_dir = stat.S_ISDIR(os.lstat(path).st_mode)
+        if not is_dir:
+            os.remove(path)
+        else:
+            _fast_rmtree(path)
+        log(f"Deleted: {path}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log(f"Failed: {path} ({e})")
 
 # ---------------------------
 # Clean profile
@@ -105,18 +205,40 @@ LOOSE_FILES = [
 ]
 
 def clean_profile(profile_path):
+    log(f"Cleaning profile: {profile_path}")
+    # One directory scan replaces an exists() stat per candidate name
+    try:
+        with os.scandir(profile_path) as it:
+            present = {e.name: e for e in it}
+    except OSError as e:
+        log(f"Failed: {profile_path} ({e})")
+        return
+    # Batch every cache directory into a single native delete
+    dirs = []
+    # Ordered lists keep deletion order and output stable between runs
     for item in COMMON_ITEMS:
-        remove_path(os.path.join(profile_path, item))
-    for db in DB_FILES:
-        remove_path(os.path.join(profile_path, db))
-    for f in LOOSE_FILES:
-        remove_path(os.path.join(profile_path, f))
+        entry = present.get(item)
+        if entry is None:
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            dirs.append(entry.path)
+        else:
+            remove_path(entry.path, is_dir=False)
+    _fast_rmtree(*dirs)
+    for d in dirs:
+        log(f"Deleted: {d}")
+    for name in DB_FILES + LOOSE_FILES:
+        entry = present.get(name)
+        if entry is None:
+            continue
+        remove_path(entry.path, is_dir=entry.is_dir(follow_symlinks=False))
 
 def find_profiles(browser_key):
-    base = APP_NAMES[browser_key].get(OS_KEY)
-    if not base or not os.path.exists(base):
+    base = browser_base(browser_key)
+    if not os.path.exists(base):
         return []
-    return [os.path.join(base, d) for d in os.listdir(base) if os.path.isdir(os.path.join(base, d))]
+    with os.scandir(base) as it:
+        return [e.path for e in it if e.is_dir(follow_symlinks=False)]
 
 # ---------------------------
 # Main
@@ -130,11 +252,10 @@ def run_cleaner():
         if not profiles:
             print("No profiles found.")
             continue
-        for p in profiles:
-            print(f"Cleaning profile: {p}")
-            clean_profile(p)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list(executor.map(clean_profile, profiles))
         # Also remove Local State (sign-in info)
-        base = APP_NAMES[browser][OS_KEY]
+        base = browser_base(browser)
         remove_path(os.path.join(base, "Local State"))
     print("\n✅ Cleaning complete!")
 